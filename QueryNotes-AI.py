@@ -5,130 +5,20 @@ import streamlit as st
 import pandas as pd
 from docx import Document
 from docx.shared import RGBColor, Inches, Pt
-from crewai import Agent, Task, Crew, LLM
+from crewai import LLM
 import os
 from datetime import datetime
 import google.generativeai as genai
-from crewai import Agent, Task, Crew, Process
 import re
 from dotenv import load_dotenv
+from answers import get_answer_with_crewai, get_answer_original
+from prompts import MODEL_NAME, CREWAI_MODEL, TEMPERATURE
+import answer_bank
 
 load_dotenv()
 api_key = os.getenv("GOOGLE_API_KEY")
 
 
-def get_answer_with_crewai(user_query, gemini_llm):
-    try:
-        researcher = Agent(
-            role="Research Specialist",
-            goal="Analyze questions and identify key concepts",
-            backstory="Expert tutor who identifies learning needs.",
-            verbose=False,
-            allow_delegation=False,
-            llm=gemini_llm
-        )
-
-        writer = Agent(
-            role="Content Writer",
-            goal="Create clear, student-friendly explanations with proper formatting",
-            backstory="Skilled educator who explains concepts simply with clear section headers.",
-            verbose=False,
-            allow_delegation=False,
-            llm=gemini_llm
-        )
-
-        quality_checker = Agent(
-            role="Quality Checker",
-            goal="Ensure accuracy and completeness",
-            backstory="Experienced teacher ensuring study material quality.",
-            verbose=False,
-            allow_delegation=False,
-            llm=gemini_llm
-        )
-
-        research_task = Task(
-            description=f"Analyze: {user_query}\n\nIdentify key concepts.",
-            expected_output="Analysis of concepts",
-            agent=researcher
-        )
-
-        writing_task = Task(
-            description=f"""Create student-friendly answer for: {user_query}
-
-                        Use this format:
-                        - Start sections with ## SECTION_NAME (e.g., ## Definition, ## Key Points, ## Example)
-                        - Use simple language, examples, numbered steps
-                        - Include relevant sections like: Definition, Explanation, Key Points, Steps, Example, Summary
-                        - No other markdown formatting
-                        
-                        Example format:
-                        ## Definition
-                        [explanation here]
-                        
-                        ## Key Points
-                        1. Point one
-                        2. Point two
-                        
-                        ## Example
-                        [example here]""",
-            expected_output="Clear, comprehensive answer with sections",
-            agent=writer,
-            context=[research_task]
-        )
-
-        quality_task = Task(
-            description="Review answer for clarity, accuracy, format. Ensure student-ready.",
-            expected_output="Polished final answer",
-            agent=quality_checker,
-            context=[writing_task]
-        )
-
-        crew = Crew(
-            agents=[researcher, writer, quality_checker],
-            tasks=[research_task, writing_task, quality_task],
-            process=Process.sequential,
-            verbose=False
-        )
-
-        result = crew.kickoff()
-        return result.raw if hasattr(result, 'raw') else str(result)
-    except Exception as e:
-        return f"Error: {str(e)}"
-
-
-def get_answer_original(user_query, api_key):
-    try:
-        prompt = f"""You are an expert tutor. Question: {user_query}
-
-                    Provide clear, comprehensive answer with proper formatting.
-                    
-                    Use this format:
-                    - Start sections with ## SECTION_NAME (e.g., ## Definition, ## Key Points, ## Example)
-                    - Use simple language, examples, numbered steps
-                    - Include relevant sections like: Definition, Explanation, Key Points, Steps, Example, Summary
-                    - No other markdown formatting
-                    
-                    Example format:
-                    ## Definition
-                    [explanation here]
-                    
-                    ## Key Points
-                    1. Point one
-                    2. Point two
-                    
-                    ## Example
-                    [example here]"""
-
-        model = genai.GenerativeModel(
-            model_name="gemini-2.5-flash",
-            generation_config={"temperature": 0.1}
-        )
-        response = model.generate_content(prompt)
-        return response.text
-    except Exception as e:
-        return f"Error: {str(e)}"
-
-
 def format_answer_in_doc(doc, answer_text):
     """Parse answer text and format sections with colored headers, removing markdown"""
     lines = answer_text.split('\n')
@@ -177,7 +67,20 @@ def generate_docx(questions, use_crewai, api_key, gemini_llm):
     # Create a single placeholder for progress updates (CHANGE 1)
     progress_placeholder = st.empty()
 
+    # Log questions for the precompute job and check the warm answer bank first
+    mode = answer_bank.mode_for(use_crewai)
+    fingerprint = answer_bank.prompt_fingerprint(mode)
+    try:
+        answer_bank.log_questions(questions)
+    except OSError:
+        pass
+    bank = answer_bank.load_bank()
+
     for i, question in enumerate(questions):
+        # A missing or malformed bank entry just falls through to the live call
+        answer = answer_bank.lookup_answer(bank, question, mode, fingerprint)
+        from_bank = answer is not None
+
         try:
             # Add question
             q_run = doc.add_paragraph().add_run(f"Q{i + 1}: {question}")
@@ -186,11 +89,12 @@ def generate_docx(questions, use_crewai, api_key, gemini_llm):
 
             # Generate answer
             try:
-                answer = get_answer_with_crewai(question, gemini_llm) if use_crewai else get_answer_original(
-                    question, api_key)
+                if not from_bank:
+                    answer = get_answer_with_crewai(question, gemini_llm) if use_crewai else get_answer_original(
+                        question, api_key)
                 
                 # Update progress in same location (CHANGE 1)
-                progress_placeholder.success(f"✅ Q{i + 1}/{len(questions)} completed {'(Multi-Agent)' if use_crewai else ''}")
+                progress_placeholder.success(f"✅ Q{i + 1}/{len(questions)} completed {'(Multi-Agent)' if use_crewai else ''}{' (Answer Bank)' if from_bank else ''}")
 
                 # Add formatted answer
                 doc.add_paragraph("Answer:")
@@ -374,7 +278,7 @@ with left_col:
 
     try:
         if api_key:
-            GEMINI_LLM = LLM(model="gemini/gemini-2.5-flash", temperature=0.1, api_key=api_key)
+            GEMINI_LLM = LLM(model=CREWAI_MODEL, temperature=TEMPERATURE, api_key=api_key)
     except:
         pass
 
@@ -442,7 +346,7 @@ with left_col:
 
     if st.button("🚀 Generate My Study Notes Now!", use_container_width=True):
         try:
-            model = genai.GenerativeModel(model_name="gemini-2.5-flash")
+            model = genai.GenerativeModel(model_name=MODEL_NAME)
             response = model.generate_content("Say 'OK'")
             # st.success("✅ Connection OK!")
         except Exception as e:
@@ -514,7 +418,7 @@ with right_col:
     if api_key:
         if st.button("🔍 Test Connection", use_container_width=True):
             try:
-                model = genai.GenerativeModel(model_name="gemini-2.5-flash")
+                model = genai.GenerativeModel(model_name=MODEL_NAME)
                 response = model.generate_content("Say 'OK'")
                 st.success("✅ Connection OK!")
             except Exception as e:
@@ -0,0 +1,342 @@
+# Warm answer bank for QueryNotes-AI.
+#
+# The app logs every question it is asked. An off-peak precompute job ranks the most
+# frequent (normalized) recent questions and generates their answers in both modes, so
+# that generate_docx can serve popular syllabus questions without a live Gemini call.
+#
+# Run the job with:  python answer_bank.py --top-n 200
+# Add --loop to keep it running and refresh the bank every off-peak window.
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+
+import prompts
+
+
+BANK_DIR = os.getenv("ANSWER_BANK_DIR", "answer_bank")
+QUESTION_LOG_FILE = os.path.join(BANK_DIR, "question_log.jsonl")
+BANK_FILE = os.path.join(BANK_DIR, "answers.json")
+
+# Default off-peak window in local hours, [start, end). Wraps past midnight if start > end.
+# Override with ANSWER_BANK_OFF_PEAK_START / ANSWER_BANK_OFF_PEAK_END.
+DEFAULT_OFF_PEAK = (1, 6)
+
+# Questions asked within this many days are ranked; older log records are compacted away
+DEFAULT_SINCE_DAYS = 30
+LOG_RETENTION_DAYS = 90
+
+# Consecutive "Error:" answers (usually an exhausted quota) after which a precompute run stops
+MAX_CONSECUTIVE_ERRORS = 3
+
+MODE_ORIGINAL = "original"
+MODE_CREWAI = "crewai"
+MODES = (MODE_ORIGINAL, MODE_CREWAI)
+
+
+def mode_for(use_crewai):
+    return MODE_CREWAI if use_crewai else MODE_ORIGINAL
+
+
+def normalize_question(question):
+    """Lowercase, collapse whitespace and drop trailing punctuation so near-duplicates share a key"""
+    key = re.sub(r"\s+", " ", str(question)).strip().lower()
+    return key.rstrip("?.!: ").strip()
+
+
+def prompt_fingerprint(mode):
+    """Hash of every setting and prompt text a mode uses; banked answers with another fingerprint are stale"""
+    if mode == MODE_CREWAI:
+        parts = [
+            prompts.CREWAI_MODEL,
+            prompts.TEMPERATURE,
+            prompts.RESEARCHER,
+            prompts.WRITER,
+            prompts.QUALITY_CHECKER,
+            prompts.RESEARCH_TASK_TEMPLATE,
+            prompts.RESEARCH_EXPECTED_OUTPUT,
+            prompts.WRITING_TASK_TEMPLATE,
+            prompts.WRITING_EXPECTED_OUTPUT,
+            prompts.QUALITY_TASK_DESCRIPTION,
+            prompts.QUALITY_EXPECTED_OUTPUT,
+        ]
+    else:
+        parts = [
+            prompts.MODEL_NAME,
+            prompts.TEMPERATURE,
+            prompts.ORIGINAL_PROMPT_TEMPLATE,
+        ]
+    payload = json.dumps([mode] + parts, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+# QUESTION FREQUENCY LOG
+
+def log_questions(questions, log_file=QUESTION_LOG_FILE):
+    """Append the questions of a real run to the frequency log"""
+    os.makedirs(os.path.dirname(log_file) or ".", exist_ok=True)
+    timestamp = datetime.now().isoformat(timespec="seconds")
+    with open(log_file, "a", encoding="utf-8") as f:
+        for question in questions:
+            key = normalize_question(question)
+            if key:
+                f.write(json.dumps({"key": key, "question": question.strip(), "ts": timestamp}) + "\n")
+
+
+def _read_log(log_file):
+    """Yield (record, line, asked_at) for every well-formed log record, skipping anything else"""
+    with open(log_file, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+                key, question = record["key"], record["question"]
+                asked_at = datetime.fromisoformat(record["ts"])
+            except (ValueError, TypeError, KeyError):
+                continue
+            # log_questions writes naive local time; offset timestamps would not compare with the cutoff
+            if isinstance(key, str) and isinstance(question, str) and key and asked_at.tzinfo is None:
+                yield record, line, asked_at
+
+
+def top_questions(top_n, log_file=QUESTION_LOG_FILE, since_days=DEFAULT_SINCE_DAYS, now=None):
+    """Return [(key, question, count)] for the top_n most asked normalized questions of the last since_days"""
+    if not os.path.exists(log_file):
+        return []
+
+    cutoff = (now or datetime.now()) - timedelta(days=since_days) if since_days is not None else None
+    counts = Counter()
+    first_seen = {}
+    for record, line, asked_at in _read_log(log_file):
+        if cutoff is not None and asked_at < cutoff:
+            continue
+        counts[record["key"]] += 1
+        first_seen.setdefault(record["key"], record["question"])
+
+    return [(key, first_seen[key], count) for key, count in counts.most_common(top_n)]
+
+
+def compact_log(log_file=QUESTION_LOG_FILE, keep_days=LOG_RETENTION_DAYS, now=None):
+    """
+    Drop malformed records and records older than keep_days. Returns the number of records kept.
+
+    The live log is renamed aside first, so questions the app logs meanwhile go to a fresh
+    file; the kept records are then appended back to it instead of replacing it.
+    """
+    compacting_file = f"{log_file}.compacting"
+    # A leftover file from an interrupted compaction is finished before taking a new one
+    if not os.path.exists(compacting_file):
+        if not os.path.exists(log_file):
+            return 0
+        os.replace(log_file, compacting_file)
+
+    cutoff = (now or datetime.now()) - timedelta(days=keep_days)
+    kept = [line if line.endswith("\n") else line + "\n"
+            for record, line, asked_at in _read_log(compacting_file) if asked_at >= cutoff]
+
+    with open(log_file, "a", encoding="utf-8") as f:
+        f.write("".join(kept))
+    os.remove(compacting_file)
+    return len(kept)
+
+
+# BANK STORAGE
+
+def load_bank(bank_file=BANK_FILE):
+    if not os.path.exists(bank_file):
+        return {}
+    try:
+        with open(bank_file, encoding="utf-8") as f:
+            bank = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return bank if isinstance(bank, dict) else {}
+
+
+def save_bank(bank, bank_file=BANK_FILE):
+    """Write via a temp file so the app never reads a half-written bank"""
+    os.makedirs(os.path.dirname(bank_file) or ".", exist_ok=True)
+    tmp_file = f"{bank_file}.tmp"
+    with open(tmp_file, "w", encoding="utf-8") as f:
+        json.dump(bank, f, ensure_ascii=False, indent=1)
+    os.replace(tmp_file, bank_file)
+
+
+def lookup_answer(bank, question, mode, fingerprint=None):
+    """Return the banked answer for question/mode, or None if missing or stale"""
+    entries = bank.get(normalize_question(question)) if isinstance(bank, dict) else None
+    entry = entries.get(mode) if isinstance(entries, dict) else None
+    if not isinstance(entry, dict) or entry.get("fingerprint") != (fingerprint or prompt_fingerprint(mode)):
+        return None
+    answer = entry.get("answer")
+    return answer if isinstance(answer, str) else None
+
+
+def store_answer(bank, question, mode, answer, fingerprint=None):
+    bank.setdefault(normalize_question(question), {})[mode] = {
+        "answer": answer,
+        "fingerprint": fingerprint or prompt_fingerprint(mode),
+        "generated": datetime.now().isoformat(timespec="seconds"),
+    }
+
+
+def prune_bank(bank, keep_keys):
+    """Return a copy of bank without stale entries or questions outside keep_keys"""
+    fingerprints = {mode: prompt_fingerprint(mode) for mode in MODES}
+    pruned = {}
+    for key in keep_keys:
+        entries = {}
+        for mode in MODES:
+            # lookup_answer also rejects malformed entries, so only usable ones are kept
+            if lookup_answer(bank, key, mode, fingerprints[mode]) is not None:
+                entries[mode] = bank[key][mode]
+        if entries:
+            pruned[key] = entries
+    return pruned
+
+
+# PRECOMPUTE JOB
+
+def _hour_from_env(name, default):
+    try:
+        hour = int(os.getenv(name, default))
+    except ValueError:
+        return None
+    return hour if 0 <= hour <= 23 else None
+
+
+def off_peak_window():
+    """Return (start, end) hours from the environment, falling back to the default on bad or empty windows"""
+    start = _hour_from_env("ANSWER_BANK_OFF_PEAK_START", DEFAULT_OFF_PEAK[0])
+    end = _hour_from_env("ANSWER_BANK_OFF_PEAK_END", DEFAULT_OFF_PEAK[1])
+    if start is None or end is None or start == end:
+        return DEFAULT_OFF_PEAK
+    return start, end
+
+
+def is_off_peak(now=None, window=None):
+    start, end = window or off_peak_window()
+    hour = (now or datetime.now()).hour
+    if start <= end:
+        return start <= hour < end
+    return hour >= start or hour < end
+
+
+def seconds_until_off_peak(now=None, window=None):
+    start_hour = (window or off_peak_window())[0]
+    now = now or datetime.now()
+    start = now.replace(hour=start_hour, minute=0, second=0, microsecond=0)
+    if start <= now:
+        start += timedelta(days=1)
+    return (start - now).total_seconds()
+
+
+def precompute(answer_fns, top_n=200, delay=5.0, respect_window=True, bank_file=BANK_FILE,
+               log_file=QUESTION_LOG_FILE, since_days=DEFAULT_SINCE_DAYS,
+               max_errors=MAX_CONSECUTIVE_ERRORS):
+    """
+    Generate missing or stale answers for the top_n recent questions in every mode of answer_fns.
+
+    answer_fns maps a mode to a callable taking the question text. Calls are spaced by
+    `delay` seconds, and the run stops early once the off-peak window closes. The log is
+    compacted and the bank pruned to the current ranking before generating, and the run
+    gives up after max_errors failed answers in a row.
+    Returns the number of answers generated.
+    """
+    compact_log(log_file, max(since_days or 0, LOG_RETENTION_DAYS))
+    ranking = top_questions(top_n, log_file, since_days)
+    fingerprints = {mode: prompt_fingerprint(mode) for mode in MODES}
+    bank = prune_bank(load_bank(bank_file), [key for key, question, count in ranking])
+    save_bank(bank, bank_file)
+    generated = 0
+    errors = 0
+
+    for key, question, count in ranking:
+        for mode, answer_fn in answer_fns.items():
+            if lookup_answer(bank, key, mode, fingerprints[mode]) is not None:
+                continue
+            if respect_window and not is_off_peak():
+                print(f"Off-peak window closed, stopping after {generated} answers")
+                return generated
+
+            answer = answer_fn(question)
+            # The answer functions report failures as text instead of raising
+            if answer and not answer.startswith("Error:"):
+                store_answer(bank, key, mode, answer, fingerprints[mode])
+                save_bank(bank, bank_file)
+                generated += 1
+                errors = 0
+                print(f"Banked [{mode}] ({count} asks): {question[:60]}")
+            else:
+                errors += 1
+                print(f"Skipped [{mode}]: {question[:60]} - {answer}")
+                if errors >= max_errors:
+                    print(f"{errors} failed answers in a row, stopping after {generated} answers")
+                    return generated
+
+            time.sleep(delay)
+
+    return generated
+
+
+def _positive_int(value):
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {value}")
+    return number
+
+
+def main():
+    import google.generativeai as genai
+    from crewai import LLM
+    from dotenv import load_dotenv
+
+    import answers
+
+    parser = argparse.ArgumentParser(description="Precompute answers for the most asked questions")
+    parser.add_argument("--top-n", type=int, default=200, help="Number of popular questions to bank")
+    parser.add_argument("--since-days", type=_positive_int, default=DEFAULT_SINCE_DAYS,
+                        help="Rank only questions asked within this many days")
+    parser.add_argument("--delay", type=float, default=5.0, help="Seconds to wait between model calls")
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=list(MODES))
+    parser.add_argument("--now", action="store_true", help="Run immediately, ignoring the off-peak window")
+    parser.add_argument("--loop", action="store_true", help="Keep running and refresh every off-peak window")
+    args = parser.parse_args()
+
+    load_dotenv()
+    api_key = os.getenv("GOOGLE_API_KEY")
+    if not api_key:
+        raise SystemExit("Please save gemini API key in .env to continue.")
+
+    window = off_peak_window()
+    print(f"Off-peak window: {window[0]:02d}:00-{window[1]:02d}:00")
+
+    genai.configure(api_key=api_key)
+    os.environ["GOOGLE_API_KEY"] = api_key
+    gemini_llm = LLM(model=prompts.CREWAI_MODEL, temperature=prompts.TEMPERATURE, api_key=api_key)
+
+    all_fns = {
+        MODE_ORIGINAL: lambda q: answers.get_answer_original(q, api_key),
+        MODE_CREWAI: lambda q: answers.get_answer_with_crewai(q, gemini_llm),
+    }
+    answer_fns = {mode: all_fns[mode] for mode in args.modes}
+
+    while True:
+        if args.now or is_off_peak(window=window):
+            count = precompute(answer_fns, args.top_n, args.delay, respect_window=not args.now,
+                               since_days=args.since_days)
+            print(f"Answer bank refreshed: {count} new answers")
+        if not args.loop:
+            break
+        args.now = False
+        wait = seconds_until_off_peak(window=window)
+        print(f"Sleeping {wait / 3600:.1f}h until the next off-peak window")
+        time.sleep(wait)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+import google.generativeai as genai
+from crewai import Agent, Task, Crew, Process
+
+import prompts
+
+
+def get_answer_with_crewai(user_query, gemini_llm):
+    try:
+        researcher = Agent(
+            role=prompts.RESEARCHER["role"],
+            goal=prompts.RESEARCHER["goal"],
+            backstory=prompts.RESEARCHER["backstory"],
+            verbose=False,
+            allow_delegation=False,
+            llm=gemini_llm
+        )
+
+        writer = Agent(
+            role=prompts.WRITER["role"],
+            goal=prompts.WRITER["goal"],
+            backstory=prompts.WRITER["backstory"],
+            verbose=False,
+            allow_delegation=False,
+            llm=gemini_llm
+        )
+
+        quality_checker = Agent(
+            role=prompts.QUALITY_CHECKER["role"],
+            goal=prompts.QUALITY_CHECKER["goal"],
+            backstory=prompts.QUALITY_CHECKER["backstory"],
+            verbose=False,
+            allow_delegation=False,
+            llm=gemini_llm
+        )
+
+        research_task = Task(
+            description=prompts.RESEARCH_TASK_TEMPLATE.format(user_query=user_query),
+            expected_output=prompts.RESEARCH_EXPECTED_OUTPUT,
+            agent=researcher
+        )
+
+        writing_task = Task(
+            description=prompts.WRITING_TASK_TEMPLATE.format(user_query=user_query),
+            expected_output=prompts.WRITING_EXPECTED_OUTPUT,
+            agent=writer,
+            context=[research_task]
+        )
+
+        quality_task = Task(
+            description=prompts.QUALITY_TASK_DESCRIPTION,
+            expected_output=prompts.QUALITY_EXPECTED_OUTPUT,
+            agent=quality_checker,
+            context=[writing_task]
+        )
+
+        crew = Crew(
+            agents=[researcher, writer, quality_checker],
+            tasks=[research_task, writing_task, quality_task],
+            process=Process.sequential,
+            verbose=False
+        )
+
+        result = crew.kickoff()
+        return result.raw if hasattr(result, 'raw') else str(result)
+    except Exception as e:
+        return f"Error: {str(e)}"
+
+
+def get_answer_original(user_query, api_key):
+    try:
+        prompt = prompts.ORIGINAL_PROMPT_TEMPLATE.format(user_query=user_query)
+
+        model = genai.GenerativeModel(
+            model_name=prompts.MODEL_NAME,
+            generation_config={"temperature": prompts.TEMPERATURE}
+        )
+        response = model.generate_content(prompt)
+        return response.text
+    except Exception as e:
+        return f"Error: {str(e)}"
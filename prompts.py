@@ -0,0 +1,74 @@
+# Model settings and every prompt text used to generate answers.
+# Kept free of heavy imports so answer_bank.py can fingerprint them: changing anything
+# here invalidates the previously banked answers of the affected mode.
+
+MODEL_NAME = "gemini-2.5-flash"
+CREWAI_MODEL = f"gemini/{MODEL_NAME}"
+TEMPERATURE = 0.1
+
+# Multi-agent (CrewAI) prompts
+RESEARCHER = {
+    "role": "Research Specialist",
+    "goal": "Analyze questions and identify key concepts",
+    "backstory": "Expert tutor who identifies learning needs.",
+}
+
+WRITER = {
+    "role": "Content Writer",
+    "goal": "Create clear, student-friendly explanations with proper formatting",
+    "backstory": "Skilled educator who explains concepts simply with clear section headers.",
+}
+
+QUALITY_CHECKER = {
+    "role": "Quality Checker",
+    "goal": "Ensure accuracy and completeness",
+    "backstory": "Experienced teacher ensuring study material quality.",
+}
+
+RESEARCH_TASK_TEMPLATE = "Analyze: {user_query}\n\nIdentify key concepts."
+RESEARCH_EXPECTED_OUTPUT = "Analysis of concepts"
+
+WRITING_TASK_TEMPLATE = """Create student-friendly answer for: {user_query}
+
+                        Use this format:
+                        - Start sections with ## SECTION_NAME (e.g., ## Definition, ## Key Points, ## Example)
+                        - Use simple language, examples, numbered steps
+                        - Include relevant sections like: Definition, Explanation, Key Points, Steps, Example, Summary
+                        - No other markdown formatting
+                        
+                        Example format:
+                        ## Definition
+                        [explanation here]
+                        
+                        ## Key Points
+                        1. Point one
+                        2. Point two
+                        
+                        ## Example
+                        [example here]"""
+WRITING_EXPECTED_OUTPUT = "Clear, comprehensive answer with sections"
+
+QUALITY_TASK_DESCRIPTION = "Review answer for clarity, accuracy, format. Ensure student-ready."
+QUALITY_EXPECTED_OUTPUT = "Polished final answer"
+
+# Single-model prompt
+ORIGINAL_PROMPT_TEMPLATE = """You are an expert tutor. Question: {user_query}
+
+                    Provide clear, comprehensive answer with proper formatting.
+                    
+                    Use this format:
+                    - Start sections with ## SECTION_NAME (e.g., ## Definition, ## Key Points, ## Example)
+                    - Use simple language, examples, numbered steps
+                    - Include relevant sections like: Definition, Explanation, Key Points, Steps, Example, Summary
+                    - No other markdown formatting
+                    
+                    Example format:
+                    ## Definition
+                    [explanation here]
+                    
+                    ## Key Points
+                    1. Point one
+                    2. Point two
+                    
+                    ## Example
+                    [example here]"""
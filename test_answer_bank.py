@@ -0,0 +1,185 @@
+import json
+import os
+from datetime import datetime, timedelta
+
+import pytest
+
+import answer_bank
+import prompts
+
+
+@pytest.fixture
+def files(tmp_path):
+    return str(tmp_path / "question_log.jsonl"), str(tmp_path / "answers.json")
+
+
+def write_log(log_file, records):
+    with open(log_file, "a", encoding="utf-8") as f:
+        for record in records:
+            f.write((record if isinstance(record, str) else json.dumps(record)) + "\n")
+
+
+def run(answer_fns, log_file, bank_file, **kwargs):
+    return answer_bank.precompute(answer_fns, delay=0, respect_window=False,
+                                  bank_file=bank_file, log_file=log_file, **kwargs)
+
+
+def test_normalize_question():
+    assert answer_bank.normalize_question("  What is   DNA? ") == "what is dna"
+    assert answer_bank.normalize_question("what is dna") == "what is dna"
+
+
+def test_top_questions_counts_normalized_keys(files):
+    log_file, _ = files
+    answer_bank.log_questions(["What is DNA?", "what is  dna", "Newton's law"], log_file)
+
+    assert answer_bank.top_questions(5, log_file) == [
+        ("what is dna", "What is DNA?", 2),
+        ("newton's law", "Newton's law", 1),
+    ]
+
+
+def test_top_questions_skips_malformed_records(files):
+    log_file, _ = files
+    answer_bank.log_questions(["What is DNA?"], log_file)
+    write_log(log_file, [
+        "not json",
+        "[1, 2]",
+        '{"x": 1}',
+        '{"key": 1, "question": "q", "ts": "x"}',
+        {"key": "utc", "question": "UTC", "ts": datetime.now().isoformat(timespec="seconds") + "+00:00"},
+    ])
+
+    assert answer_bank.top_questions(5, log_file) == [("what is dna", "What is DNA?", 1)]
+
+
+def test_top_questions_ignores_old_records_and_compaction_drops_them(files):
+    log_file, _ = files
+    old = (datetime.now() - timedelta(days=200)).isoformat(timespec="seconds")
+    write_log(log_file, [{"key": "old question", "question": "Old question", "ts": old}] * 3)
+    answer_bank.log_questions(["New question"], log_file)
+
+    assert answer_bank.top_questions(5, log_file, since_days=30) == [("new question", "New question", 1)]
+    assert answer_bank.top_questions(5, log_file, since_days=None)[0][0] == "old question"
+    assert answer_bank.top_questions(5, log_file, since_days=0) == []
+
+    assert answer_bank.compact_log(log_file, keep_days=90) == 1
+    assert answer_bank.top_questions(5, log_file, since_days=None) == [("new question", "New question", 1)]
+    assert not os.path.exists(log_file + ".compacting")
+
+
+def test_compact_log_keeps_questions_logged_during_compaction(files):
+    log_file, _ = files
+    answer_bank.log_questions(["Before"], log_file)
+    # Simulate a compaction interrupted after moving the live log aside; the app logs meanwhile
+    os.replace(log_file, log_file + ".compacting")
+    answer_bank.log_questions(["During"], log_file)
+
+    assert answer_bank.compact_log(log_file) == 1
+    assert sorted(key for key, question, count in answer_bank.top_questions(5, log_file)) == ["before", "during"]
+    assert not os.path.exists(log_file + ".compacting")
+
+
+def test_lookup_answer_ignores_stale_fingerprint(monkeypatch):
+    bank = {}
+    answer_bank.store_answer(bank, "What is DNA?", answer_bank.MODE_CREWAI, "banked")
+    answer_bank.store_answer(bank, "What is DNA?", answer_bank.MODE_ORIGINAL, "banked")
+    assert answer_bank.lookup_answer(bank, "what is dna", answer_bank.MODE_CREWAI) == "banked"
+
+    writer = dict(prompts.WRITER, backstory="Changed backstory")
+    monkeypatch.setattr(prompts, "WRITER", writer)
+
+    assert answer_bank.lookup_answer(bank, "what is dna", answer_bank.MODE_CREWAI) is None
+    assert answer_bank.lookup_answer(bank, "what is dna", answer_bank.MODE_ORIGINAL) == "banked"
+
+
+def test_lookup_answer_ignores_malformed_entries():
+    fingerprint = answer_bank.prompt_fingerprint(answer_bank.MODE_ORIGINAL)
+    bank = {
+        "list entry": [1, 2],
+        "string mode": {answer_bank.MODE_ORIGINAL: "answer"},
+        "no answer": {answer_bank.MODE_ORIGINAL: {"fingerprint": fingerprint}},
+        "bad answer": {answer_bank.MODE_ORIGINAL: {"fingerprint": fingerprint, "answer": 42}},
+    }
+
+    for question in bank:
+        assert answer_bank.lookup_answer(bank, question, answer_bank.MODE_ORIGINAL) is None
+
+
+def test_precompute_with_corrupted_bank_uses_live_answers(files):
+    log_file, bank_file = files
+    answer_bank.log_questions(["What is DNA?"], log_file)
+    with open(bank_file, "w", encoding="utf-8") as f:
+        json.dump({"what is dna": [1, 2]}, f)
+    calls = []
+    answer_fns = {answer_bank.MODE_ORIGINAL: lambda q: calls.append(q) or "live " + q}
+
+    assert run(answer_fns, log_file, bank_file) == 1
+    assert calls == ["What is DNA?"]
+    bank = answer_bank.load_bank(bank_file)
+    assert answer_bank.lookup_answer(bank, "What is DNA?", answer_bank.MODE_ORIGINAL) == "live What is DNA?"
+
+
+def test_precompute_stops_after_consecutive_errors(files):
+    log_file, bank_file = files
+    answer_bank.log_questions([f"Question {i}" for i in range(10)], log_file)
+    calls = []
+    answer_fns = {answer_bank.MODE_ORIGINAL: lambda q: calls.append(q) or "Error: quota exceeded"}
+
+    assert run(answer_fns, log_file, bank_file, max_errors=3) == 0
+    assert len(calls) == 3
+
+
+def test_precompute_skips_error_answers(files):
+    log_file, bank_file = files
+    answer_bank.log_questions(["What is DNA?"], log_file)
+    answer_fns = {
+        answer_bank.MODE_ORIGINAL: lambda q: "## Definition\n" + q,
+        answer_bank.MODE_CREWAI: lambda q: "Error: quota exceeded",
+    }
+
+    assert run(answer_fns, log_file, bank_file) == 1
+    bank = answer_bank.load_bank(bank_file)
+    assert answer_bank.lookup_answer(bank, "What is DNA?", answer_bank.MODE_ORIGINAL) == "## Definition\nWhat is DNA?"
+    assert answer_bank.lookup_answer(bank, "What is DNA?", answer_bank.MODE_CREWAI) is None
+
+    # Already banked answers are not regenerated
+    assert run(answer_fns, log_file, bank_file) == 0
+
+
+def test_precompute_prunes_questions_outside_ranking(files):
+    log_file, bank_file = files
+    answer_bank.log_questions(["Popular", "Popular", "Rare"], log_file)
+    answer_fns = {answer_bank.MODE_ORIGINAL: lambda q: "answer " + q}
+
+    assert run(answer_fns, log_file, bank_file, top_n=2) == 2
+    assert run(answer_fns, log_file, bank_file, top_n=1) == 0
+    assert list(answer_bank.load_bank(bank_file)) == ["popular"]
+
+
+def test_save_bank_is_atomic(files):
+    _, bank_file = files
+    answer_bank.save_bank({"q": {}}, bank_file)
+
+    assert answer_bank.load_bank(bank_file) == {"q": {}}
+    assert not os.path.exists(bank_file + ".tmp")
+
+
+@pytest.mark.parametrize("window, hour, expected", [
+    ((1, 6), 0, False),
+    ((1, 6), 1, True),
+    ((1, 6), 6, False),
+    ((22, 4), 23, True),
+    ((22, 4), 3, True),
+    ((22, 4), 12, False),
+])
+def test_is_off_peak(window, hour, expected):
+    assert answer_bank.is_off_peak(datetime(2026, 1, 1, hour), window) is expected
+
+
+@pytest.mark.parametrize("start, end", [("abc", "6"), ("1", "25"), ("3", "3")])
+def test_off_peak_window_falls_back_to_default(monkeypatch, start, end):
+    monkeypatch.setenv("ANSWER_BANK_OFF_PEAK_START", start)
+    monkeypatch.setenv("ANSWER_BANK_OFF_PEAK_END", end)
+
+    assert answer_bank.off_peak_window() == answer_bank.DEFAULT_OFF_PEAK